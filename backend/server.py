@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Header
+from fastapi import FastAPI, APIRouter, HTTPException, Header, Query
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -458,8 +458,8 @@ async def summarize_youtube_video(request: VideoRequest):
 
 # Get history of previously summarized videos
 @api_router.get("/history", response_model=List[StoredTranscript])
-async def get_summary_history():
-    history = await db.transcripts.find().sort("timestamp", -1).to_list(20)
+async def get_summary_history(limit: int = Query(20, ge=1, le=20)):
+    history = await db.transcripts.find().sort("timestamp", -1).limit(limit).to_list(limit)
     
     # Process results to add any missing metadata for videos
     for item in history:
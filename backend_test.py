@@ -3,8 +3,11 @@ import requests
 import sys
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from tests.api_tester import BaseAPITester, cassette, parse_args, peek
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -12,42 +15,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class PodBriefAPITester:
-    def __init__(self, base_url="https://2741a2ce-05d6-4231-a8fb-a5540c0f1367.preview.emergentagent.com"):
-        self.base_url = base_url
-        self.api_url = f"{base_url}/api"
-        self.tests_run = 0
-        self.tests_passed = 0
+# Fields every response of each endpoint must carry
+_CHANNEL_REQUIRED = frozenset(('channel_name', 'videos'))
+_SUMMARIZE_REQUIRED = frozenset(('transcript', 'summary', 'video_id', 'url'))
+
+class PodBriefAPITester(BaseAPITester):
+    # Channel URL formats the channel-videos endpoint must understand
+    channel_urls = (
+        "https://www.youtube.com/@Fireship",
+        "https://www.youtube.com/c/TheOffice",
+        "https://www.youtube.com/user/CollegeHumor"
+    )
 
     def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
         """Run a single API test"""
-        url = f"{self.api_url}/{endpoint}"
-        if not headers:
-            headers = {'Content-Type': 'application/json'}
-        
-        self.tests_run += 1
-        logger.info(f"Testing {name}...")
+        self._record_run()
+        logger.info("Testing %s...", name)
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+            response = self._request(method, endpoint, json=data, headers=headers)
             
             success = response.status_code == expected_status
             if success:
-                self.tests_passed += 1
-                logger.info(f"✅ Passed - Status: {response.status_code}")
-                return success, response.json() if response.content else {}
+                self._record_pass()
+                logger.info("✅ Passed - Status: %d", response.status_code)
+                return success, self._json(response)
             else:
-                logger.error(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                logger.error("❌ Failed - Expected %d, got %d", expected_status, response.status_code)
+                snippet = peek(response)
+                if snippet:
+                    logger.error("Response: %s", snippet)
                 return False, {}
 
+        except requests.exceptions.Timeout:
+            logger.error("❌ Timeout after %ss", self.timeout[1])
+            return False, {}
         except Exception as e:
-            logger.error(f"❌ Failed - Error: {str(e)}")
+            logger.error("❌ Failed - Error: %s", e)
             return False, {}
 
     def test_api_status(self):
@@ -71,12 +75,9 @@ class PodBriefAPITester:
         
         if success:
             # Validate response structure
-            if "channel_name" not in response:
-                logger.error("❌ Missing 'channel_name' in response")
-                return False
-            
-            if "videos" not in response:
-                logger.error("❌ Missing 'videos' in response")
+            missing = _CHANNEL_REQUIRED.difference(response)
+            if missing:
+                logger.error("❌ Missing %s in response", ', '.join(sorted(missing)))
                 return False
             
             videos = response["videos"]
@@ -86,64 +87,65 @@ class PodBriefAPITester:
             
             # Check if we have 6 videos as expected
             if len(videos) != 6:
-                logger.warning(f"⚠️ Expected 6 videos, got {len(videos)}")
+                logger.warning("⚠️ Expected 6 videos, got %d", len(videos))
             
             # Check video structure
             for i, video in enumerate(videos):
                 if "title" not in video and "snippet" not in video:
-                    logger.error(f"❌ Video {i} missing title/snippet")
+                    logger.error("❌ Video %d missing title/snippet", i)
                     return False
                 
                 if "link" not in video and "url" not in video:
-                    logger.error(f"❌ Video {i} missing link/url")
+                    logger.error("❌ Video %d missing link/url", i)
                     return False
             
-            logger.info(f"✅ Found {len(videos)} videos for channel: {response['channel_name']}")
+            # Keyed by channel URL so later tests can reuse the list
+            self.state.setdefault('channel_videos', {})[channel_url] = videos
+            logger.info("✅ Found %d videos for channel: %s", len(videos), response['channel_name'])
             return True
         
         return False
 
     def test_summarize_video(self, video_url):
         """Test video summarization endpoint"""
-        logger.info(f"Testing video summarization for {video_url}")
+        logger.info("Testing video summarization for %s", video_url)
         
+        timeout = 60  # Longer timeout for summarization
         try:
-            response = requests.post(
-                f"{self.api_url}/summarize",
+            response = self._request(
+                "POST",
+                "summarize",
                 json={"youtube_url": video_url},
-                headers={'Content-Type': 'application/json'},
-                timeout=60  # Longer timeout for summarization
+                timeout=timeout
             )
             
             if response.status_code == 200:
-                self.tests_passed += 1
-                data = response.json()
+                self._record_pass()
+                data = self._json(response)
                 
                 # Validate response structure
-                if "transcript" not in data:
-                    logger.error("❌ Missing 'transcript' in response")
+                missing = _SUMMARIZE_REQUIRED.difference(data)
+                if missing:
+                    logger.error("❌ Missing %s in response", ', '.join(sorted(missing)))
                     return False
                 
-                if "summary" not in data:
-                    logger.error("❌ Missing 'summary' in response")
-                    return False
-                
-                if "video_id" not in data:
-                    logger.error("❌ Missing 'video_id' in response")
-                    return False
-                
-                logger.info(f"✅ Successfully summarized video: {data.get('title', 'Unknown Title')}")
+                logger.info("✅ Successfully summarized video: %s", data.get('title', 'Unknown Title'))
                 return True
             else:
-                logger.error(f"❌ Failed - Status: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                logger.error("❌ Failed - Status: %d", response.status_code)
+                snippet = peek(response)
+                if snippet:
+                    logger.error("Response: %s", snippet)
                 return False
                 
+        except requests.exceptions.Timeout:
+            logger.error("❌ Timeout after %ss", timeout)
+            return False
         except Exception as e:
-            logger.error(f"❌ Failed - Error: {str(e)}")
+            logger.error("❌ Failed - Error: %s", e)
             return False
         finally:
-            self.tests_run += 1
+            self._record_run()
 
     def test_invalid_channel_url(self):
         """Test error handling for invalid channel URL"""
@@ -178,82 +180,100 @@ class PodBriefAPITester:
         invalid_url = "https://www.youtube.com/watch?v=invalid_video_id"
         
         try:
-            response = requests.post(
-                f"{self.api_url}/summarize",
+            # Only the status matters here, so don't download the error body
+            response = self._request(
+                "POST",
+                "summarize",
                 json={"youtube_url": invalid_url},
-                headers={'Content-Type': 'application/json'}
+                stream=True
             )
+            response.close()
             
             # Should return 400 or 500 for invalid video
             if response.status_code in [400, 500]:
-                logger.info(f"✅ API correctly returned error {response.status_code} for invalid video URL")
-                self.tests_passed += 1
+                logger.info("✅ API correctly returned error %d for invalid video URL", response.status_code)
+                self._record_pass()
                 return True
             else:
-                logger.error(f"❌ API returned unexpected status {response.status_code} for invalid video URL")
+                logger.error("❌ API returned unexpected status %d for invalid video URL", response.status_code)
                 return False
                 
+        except requests.exceptions.Timeout:
+            logger.error("❌ Timeout after %ss", self.timeout[1])
+            return False
         except Exception as e:
-            logger.error(f"❌ Failed - Error: {str(e)}")
+            logger.error("❌ Failed - Error: %s", e)
             return False
         finally:
-            self.tests_run += 1
+            self._record_run()
 
-def main():
-    # Setup
-    tester = PodBriefAPITester()
-    
-    # Test API status
-    api_status_success, _ = tester.test_api_status()
-    if not api_status_success:
-        logger.error("❌ API status check failed, stopping tests")
-        return 1
-    
-    # Test channel videos with different URL formats
-    channel_urls = [
-        "https://www.youtube.com/@Fireship",
-        "https://www.youtube.com/c/TheOffice",
-        "https://www.youtube.com/user/CollegeHumor"
-    ]
-    
-    channel_success = True
-    for url in channel_urls:
-        if not tester.test_channel_videos(url):
-            channel_success = False
-            logger.error(f"❌ Channel videos test failed for {url}")
+def run_channel_stage(tester):
+    """Fetch every channel concurrently; passes if at least one channel worked"""
+    # Open the connections ahead of time so no channel pays the handshake
+    tester.warmup(len(tester.channel_urls))
+    succeeded = 0
+    with ThreadPoolExecutor(max_workers=len(tester.channel_urls)) as executor:
+        futures = {executor.submit(tester.test_channel_videos, url): url for url in tester.channel_urls}
+        for future in as_completed(futures):
+            # One channel raising shouldn't lose the rest of the batch
+            if future.exception() is None and future.result():
+                succeeded += 1
+            else:
+                logger.error("❌ Channel videos test failed for %s", futures[future])
     
-    if not channel_success:
+    if 0 < succeeded < len(futures):
         logger.warning("⚠️ Some channel tests failed, continuing with other tests")
-    
-    # Test invalid channel URL
-    tester.test_invalid_channel_url()
-    
-    # Test invalid video URL
-    tester.test_invalid_video_url()
-    
-    # Test video summarization (only if channel tests passed)
-    if channel_success:
-        # Get a video URL from one of the channels
-        logger.info("Testing video summarization...")
-        success, response = tester.run_test(
-            "Get Channel Videos for Summarization Test",
-            "POST",
-            "channel-videos",
-            200,
-            data={"channel_url": channel_urls[0]}  # Use first channel
-        )
+    return succeeded > 0
+
+def run_invalid_input_stage(tester):
+    """Run the invalid channel and invalid video URL checks together"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        invalid_checks = [
+            executor.submit(tester.test_invalid_channel_url),
+            executor.submit(tester.test_invalid_video_url)
+        ]
+        return all([future.result() for future in invalid_checks])
+
+def run_summarize_stage(tester):
+    """Summarize the first video of the first channel, reusing its fetched list"""
+    logger.info("Testing video summarization...")
+    videos = tester.state.get('channel_videos', {}).get(tester.channel_urls[0], [])
+    video_url = videos and (videos[0].get("link") or videos[0].get("url"))
+    if not video_url:
+        logger.error("❌ No video from the first channel to summarize")
+        return False
+    return tester.test_summarize_video(video_url)
+
+def main(argv=None):
+    args = parse_args("PodBrief backend API tests", argv)
+    # Setup
+    with cassette("backend_test.yaml", record=args.record), PodBriefAPITester() as tester:
+        # Each stage only runs if everything before it passed, so a broken
+        # deployment fails fast instead of waiting on the slow summarize call
+        stages = [
+            ("API status", lambda: tester.test_api_status()[0]),
+            ("Channel videos", lambda: run_channel_stage(tester)),
+            ("Video summarization", lambda: run_summarize_stage(tester))
+        ]
+        stage_results = []
+        for stage_name, stage in stages:
+            stage_results.append(stage())
+            if not stage_results[-1]:
+                logger.error("❌ %s stage failed, skipping the remaining stages", stage_name)
+                break
         
-        if success and "videos" in response and len(response["videos"]) > 0:
-            # Get the first video URL
-            video = response["videos"][0]
-            video_url = video.get("link") or video.get("url")
-            
-            if video_url:
-                tester.test_summarize_video(video_url)
+        # The invalid-input checks don't gate the channel and summarize
+        # stages, but there is nothing to check against a backend that is down
+        if stage_results[0]:
+            stage_results.append(run_invalid_input_stage(tester))
     
-    # Print results
-    logger.info(f"\n📊 Tests passed: {tester.tests_passed}/{tester.tests_run}")
-    return 0 if tester.tests_passed == tester.tests_run else 1
+        # Print results
+        logger.info("\n📊 Tests passed: %d/%d", tester.tests_passed, tester.tests_run)
+        for line in tester.latency_report():
+            logger.info("⏱️ %s", line)
+        # A request counts as passed before its body is validated, so the
+        # stage results decide the exit status as well
+        return 0 if all(stage_results) and tester.tests_passed == tester.tests_run else 1
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -3,64 +3,194 @@ import requests
 import sys
 import time
 import logging
+import hashlib
 import re
-from urllib.parse import urlparse, parse_qs
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+
+import orjson
+
+from tests.api_tester import (
+    BaseAPITester,
+    EMOJI_RE,
+    SUMMARY_RE,
+    cassette,
+    parse_args,
+    peek
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class YouTubeSummarizerTester:
-    def __init__(self, base_url="https://2741a2ce-05d6-4231-a8fb-a5540c0f1367.preview.emergentagent.com"):
-        self.base_url = base_url
-        self.api_url = f"{base_url}/api"
-        self.tests_run = 0
-        self.tests_passed = 0
-        
-        # Test videos
-        self.music_video_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"  # Rick Astley - Never Gonna Give You Up
-        self.comedy_sketch_url = "https://www.youtube.com/watch?v=THNPmhBl-8I"  # Mitchell and Webb - Brain Surgery
-        self.ted_talk_url = "https://www.youtube.com/watch?v=_vS_b7cJn2A"  # TED talk
-        self.educational_video_url = "https://www.youtube.com/watch?v=8S0FDjFBj8o"  # Educational video
-        self.invalid_video_url = "https://www.youtube.com/watch?v=invalid"
+_YT_ID_RE = re.compile(r'[?&]v=([A-Za-z0-9_-]{11})')
+
+# Fields every stored history item must carry
+_HISTORY_REQUIRED = frozenset(('id', 'video_id', 'url', 'transcript', 'summary', 'timestamp'))
+
+# Metadata the recent-videos list needs on each item, and what it can do without
+_RECENT_REQUIRED = ('video_id',)
+_RECENT_OPTIONAL = ('title', 'channel', 'thumbnail_url')
+
+# INFO lines of the test currently running on each thread
+_log_batch = threading.local()
+
+@contextmanager
+def batched_log():
+    """Collect this thread's _info lines and emit them as one INFO record on exit.
+
+    _warning and _error flush the lines collected so far before logging, so
+    a failure always follows the progress that led up to it. A nested batch
+    joins the outer one.
+    """
+    if getattr(_log_batch, 'lines', None) is not None:
+        yield
+        return
+    _log_batch.lines = []
+    try:
+        yield
+    finally:
+        _flush_batch()
+        _log_batch.lines = None
+
+def _flush_batch():
+    lines = getattr(_log_batch, 'lines', None)
+    if lines:
+        # Worker threads may still be appending to a carried batch, so only
+        # drop the lines that were actually emitted
+        pending = lines[:]
+        del lines[:len(pending)]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('\n'.join(msg % args if args else msg for msg, args in pending))
+
+def _carry_batch(func):
+    """Wrap func so it logs into the calling thread's batch when run on a worker thread"""
+    lines = getattr(_log_batch, 'lines', None)
+
+    def run(*args, **kwargs):
+        _log_batch.lines = lines
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _log_batch.lines = None
+    return run
+
+def _info(msg, *args):
+    """logger.info, deferred to the end of the current batch if one is open"""
+    lines = getattr(_log_batch, 'lines', None)
+    if lines is None:
+        logger.info(msg, *args)
+    else:
+        lines.append((msg, args))
+
+def _warning(msg, *args):
+    _flush_batch()
+    logger.warning(msg, *args)
+
+def _error(msg, *args):
+    _flush_batch()
+    logger.error(msg, *args)
+
+@lru_cache(maxsize=128)
+def _extract_video_id(url):
+    """Return the 11-character video ID from a watch URL, or '' if there is none"""
+    match = _YT_ID_RE.search(url)
+    return match.group(1) if match else ''
+
+class YouTubeSummarizerTester(BaseAPITester):
+    # Test videos
+    music_video_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"  # Rick Astley - Never Gonna Give You Up
+    comedy_sketch_url = "https://www.youtube.com/watch?v=THNPmhBl-8I"  # Mitchell and Webb - Brain Surgery
+    ted_talk_url = "https://www.youtube.com/watch?v=_vS_b7cJn2A"  # TED talk
+    educational_video_url = "https://www.youtube.com/watch?v=8S0FDjFBj8o"  # Educational video
+    invalid_video_url = "https://www.youtube.com/watch?v=invalid"
+
+    # (url, label) pairs summarized by the suite
+    video_cases = (
+        (music_video_url, "Music"),
+        (comedy_sketch_url, "Comedy Sketch"),
+        (ted_talk_url, "TED Talk")
+    )
+
+    # Number of videos the recent-videos list shows
+    recent_videos_limit = 6
+
+    # Seconds a saved first-summarization response stays valid on disk
+    fixture_max_age = 7 * 24 * 60 * 60
+
+    def __init__(self, *args, reuse_first_summary=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Whether the caching test may stand in a saved response for its first
+        # request; off while replaying a cassette, whose first recorded POST
+        # would otherwise answer the second request
+        self.reuse_first_summary = reuse_first_summary
+        # IDs of the suite's own videos, parsed once up front
+        self._video_ids = {
+            url: _extract_video_id(url)
+            for url in (self.music_video_url, self.comedy_sketch_url, self.ted_talk_url, self.educational_video_url)
+        }
+
+    def _fixture_path(self, video_id):
+        # Keyed on the deployment too - another backend may never have seen the video
+        host_key = hashlib.sha1(self.base_url.encode()).hexdigest()[:12]
+        return Path(tempfile.gettempdir()) / f"pods_{host_key}_{video_id}.json"
+
+    def _load_fixture(self, video_id):
+        """Return the saved first-summarization response for a video, or None if missing or stale"""
+        path = self._fixture_path(video_id)
+        try:
+            if time.time() - path.stat().st_mtime > self.fixture_max_age:
+                return None
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _save_fixture(self, video_id, data, elapsed_ns):
+        try:
+            self._fixture_path(video_id).write_bytes(orjson.dumps({'data': data, 'elapsed_ns': elapsed_ns}))
+        except OSError as e:
+            _warning("⚠️ Could not save summarization fixture: %s", e)
 
     def run_test(self, name, method, endpoint, expected_status, data=None, validate_func=None):
         """Run a single API test"""
-        url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        self.tests_run += 1
-        logger.info(f"\n🔍 Testing {name}...")
+        self._record_run()
+        _info("\n🔍 Testing %s...", name)
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            response = self._request(method, endpoint, json=data)
 
             success = response.status_code == expected_status
             
             if success:
-                self.tests_passed += 1
-                logger.info(f"✅ Passed - Status: {response.status_code}")
+                _info("✅ Passed - Status: %d", response.status_code)
                 
                 if validate_func and callable(validate_func):
                     validation_result = validate_func(response)
                     if not validation_result:
                         success = False
-                        self.tests_passed -= 1
-                        logger.error("❌ Validation failed")
+                        _error("❌ Validation failed")
+                
+                if success:
+                    self._record_pass()
             else:
-                logger.error(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
-                if response.text:
-                    logger.error(f"Response: {response.text[:500]}")
+                _error("❌ Failed - Expected %d, got %d", expected_status, response.status_code)
+                snippet = peek(response)
+                if snippet:
+                    _error("Response: %s", snippet)
 
             return success, response
 
+        except requests.exceptions.Timeout:
+            _error("❌ Timeout after %ss", self.timeout[1])
+            return False, None
         except Exception as e:
-            logger.error(f"❌ Failed - Error: {str(e)}")
+            _error("❌ Failed - Error: %s", e)
             return False, None
 
     def test_api_status(self):
@@ -82,9 +212,14 @@ class YouTubeSummarizerTester:
             data={"youtube_url": self.invalid_video_url}
         )
 
+    @batched_log()
     def test_valid_youtube_url(self, video_url, video_type):
-        """Test summarizing a valid YouTube URL"""
-        logger.info(f"\n⏳ Testing {video_type} video summarization (this may take a minute)...")
+        """Test summarizing a valid YouTube URL.
+
+        Returns the lengths and 200-character samples of the transcript and
+        summary rather than the response, so the full body can be freed.
+        """
+        _info("\n⏳ Testing %s video summarization (this may take a minute)...", video_type)
         
         success, response = self.run_test(
             f"Summarize {video_type} Video",
@@ -94,289 +229,387 @@ class YouTubeSummarizerTester:
             data={"youtube_url": video_url}
         )
         
+        details = None
         if success:
             try:
-                data = response.json()
+                data = self._json(response)
+                transcript = data.get('transcript') or ''
+                summary = data.get('summary') or ''
+                transcript_length, summary_length = len(transcript), len(summary)
+                transcript_sample = (transcript[:200] + "...") if transcript_length > 200 else transcript
+                # Only the transcript's length and sample are needed from here
+                # on - drop the parsed body so concurrent workers don't each
+                # hold a full transcript through the remaining checks
+                del data, transcript, response
                 
                 # Validate response structure
-                logger.info("\n🔍 Validating transcript and summary content...")
+                _info("\n🔍 Validating transcript and summary content...")
                 
                 # Check if transcript exists and is not empty
-                has_transcript = 'transcript' in data and data['transcript']
+                has_transcript = transcript_length > 0
                 if has_transcript:
-                    logger.info("✅ Transcript is not empty")
+                    _info("✅ Transcript is not empty")
                 else:
-                    logger.error("❌ Transcript is empty or missing")
+                    _error("❌ Transcript is empty or missing")
                     success = False
                 
                 # Check if summary exists and is not empty
-                has_summary = 'summary' in data and data['summary']
+                has_summary = summary_length > 0
                 if has_summary:
-                    logger.info("✅ Summary is not empty")
-                    
-                    # Check for emojis in the summary
-                    emoji_pattern = re.compile(r'[\U0001F300-\U0001F6FF\U0001F700-\U0001F77F\U0001F780-\U0001F7FF\U0001F800-\U0001F8FF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF2702-27B024C2-\U0001F251\U0001f926-\U0001f937]')
-                    emojis_found = emoji_pattern.findall(data['summary'])
+                    _info("✅ Summary is not empty")
                     
+                    # Check for emojis in the summary, counting music and
+                    # other emojis in the same single scan
+                    counts = Counter()
+                    emojis_found = []
+                    for match in SUMMARY_RE.finditer(summary):
+                        counts[match.lastgroup] += 1
+                        emojis_found.append(match.group())
                     if emojis_found:
-                        logger.info(f"✅ Found {len(emojis_found)} emojis in summary: {''.join(emojis_found[:10])}")
+                        if logger.isEnabledFor(logging.INFO):
+                            _info("✅ Found %d emojis in summary: %s", len(emojis_found), ''.join(islice(emojis_found, 10)))
                     else:
-                        logger.warning("⚠️ No emojis found in summary")
+                        _warning("⚠️ No emojis found in summary")
                         
                     # Special check for music videos
                     if video_url == self.music_video_url:
-                        if "🎵" in data['summary'] or "🎶" in data['summary'] or "🎤" in data['summary']:
-                            logger.info("✅ Music video has music-related emojis in summary")
+                        if counts['music']:
+                            _info("✅ Music video has music-related emojis in summary")
                         else:
-                            logger.warning("⚠️ Music video summary doesn't have music-related emojis")
+                            _warning("⚠️ Music video summary doesn't have music-related emojis")
                 else:
-                    logger.error("❌ Summary is empty or missing")
+                    _error("❌ Summary is empty or missing")
                     success = False
                 
                 # Extract video ID from URL
-                parsed_url = urlparse(video_url)
-                video_id = parse_qs(parsed_url.query).get('v', [''])[0]
+                video_id = self._video_ids.get(video_url) or _extract_video_id(video_url)
                 
                 if video_id:
-                    logger.info(f"✅ Valid video ID: {video_id}")
-                    logger.info(f"✅ Valid URL: {video_url}")
+                    _info("✅ Valid video ID: %s", video_id)
+                    _info("✅ Valid URL: %s", video_url)
                 else:
-                    logger.error("❌ Could not extract video ID from URL")
+                    _error("❌ Could not extract video ID from URL")
                     success = False
                 
                 # Check if summary is shorter than transcript (as expected)
                 if has_transcript and has_summary:
-                    transcript_length = len(data['transcript'])
-                    summary_length = len(data['summary'])
-                    
                     if summary_length < transcript_length:
-                        logger.info("✅ Summary is shorter than transcript (as expected)")
-                        logger.info(f"📏 Transcript length: {transcript_length} characters")
-                        logger.info(f"📏 Summary length: {summary_length} characters")
+                        _info("✅ Summary is shorter than transcript (as expected)")
+                        _info("📏 Transcript length: %d characters", transcript_length)
+                        _info("📏 Summary length: %d characters", summary_length)
                     else:
-                        logger.warning("⚠️ Summary is not shorter than transcript")
-                        logger.info(f"📏 Transcript length: {transcript_length} characters")
-                        logger.info(f"📏 Summary length: {summary_length} characters")
+                        _warning("⚠️ Summary is not shorter than transcript")
+                        _info("📏 Transcript length: %d characters", transcript_length)
+                        _info("📏 Summary length: %d characters", summary_length)
                 
-                # Print a sample of the transcript and summary for verification
-                if has_transcript:
-                    transcript_sample = data['transcript'][:200] + "..." if len(data['transcript']) > 200 else data['transcript']
-                    logger.info(f"📝 Transcript sample: {transcript_sample}")
+                summary_sample = (summary[:200] + "...") if summary_length > 200 else summary
+                details = {
+                    'video_id': video_id,
+                    'transcript_length': transcript_length,
+                    'summary_length': summary_length,
+                    'transcript_sample': transcript_sample,
+                    'summary_sample': summary_sample
+                }
                 
-                if has_summary:
-                    summary_sample = data['summary'][:200] + "..." if len(data['summary']) > 200 else data['summary']
-                    logger.info(f"📝 Summary sample: {summary_sample}")
+                # Print a sample of the transcript and summary for verification
+                if logger.isEnabledFor(logging.INFO):
+                    if has_transcript:
+                        _info("📝 Transcript sample: %s", transcript_sample)
+                    
+                    if has_summary:
+                        _info("📝 Summary sample: %s", summary_sample)
                 
             except Exception as e:
-                logger.error(f"❌ Error validating response: {str(e)}")
+                _error("❌ Error validating response: %s", e)
                 success = False
         
-        return success, response
+        return success, details
+
+    def _fetch_history(self, name):
+        """Fetch the recent history once and share it between the history checks.
 
+        Returns (success, items). A caller served from the stored list still
+        counts as a test of its own.
+        """
+        history_items = self.state.get('history')
+        if history_items is None:
+            success, response = self.run_test(
+                name,
+                "GET",
+                f"history?limit={self.recent_videos_limit}",
+                200
+            )
+            if not success:
+                return False, []
+            history_items = self.state['history'] = self._json(response) or []
+        else:
+            self._record_run()
+            _info("\n🔍 Testing %s...", name)
+            _info("✅ Passed - reusing the fetched history")
+            self._record_pass()
+        return True, history_items
+
+    @batched_log()
     def test_get_history(self):
         """Test getting the summary history"""
-        success, response = self.run_test(
-            "Get Summary History",
-            "GET",
-            "history",
-            200
-        )
+        success, history_items = self._fetch_history("Get Summary History")
         
         if success:
             try:
-                history_items = response.json()
-                
-                logger.info(f"📚 History items: {len(history_items)}")
+                _info("📚 History items: %d", len(history_items))
                 
                 if history_items:
                     # Get the most recent item
                     most_recent = history_items[0]
-                    logger.info(f"📅 Most recent summary: {most_recent.get('url')} ({most_recent.get('video_id')})")
+                    _info("📅 Most recent summary: %s (%s)", most_recent.get('url'), most_recent.get('video_id'))
+                    
+                    missing = _HISTORY_REQUIRED.difference(most_recent)
+                    if missing:
+                        _error("❌ History item missing %s", ', '.join(sorted(missing)))
+                        success = False
                     
                     # Check for emojis in the most recent summary
-                    if 'summary' in most_recent and most_recent['summary']:
-                        emoji_pattern = re.compile(r'[\U0001F300-\U0001F6FF\U0001F700-\U0001F77F\U0001F780-\U0001F7FF\U0001F800-\U0001F8FF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF2702-27B024C2-\U0001F251\U0001f926-\U0001f937]')
-                        emojis_found = emoji_pattern.findall(most_recent['summary'])
-                        
-                        if emojis_found:
-                            logger.info(f"✅ Found {len(emojis_found)} emojis in history summary: {''.join(emojis_found[:10])}")
+                    recent_summary = most_recent.get('summary')
+                    if recent_summary:
+                        if EMOJI_RE.search(recent_summary):
+                            if logger.isEnabledFor(logging.INFO):
+                                emojis_found = EMOJI_RE.findall(recent_summary)
+                                _info("✅ Found %d emojis in history summary: %s", len(emojis_found), ''.join(islice(emojis_found, 10)))
                         else:
-                            logger.warning("⚠️ No emojis found in history summary")
+                            _warning("⚠️ No emojis found in history summary")
                 else:
-                    logger.warning("⚠️ No history items found")
+                    _warning("⚠️ No history items found")
                 
             except Exception as e:
-                logger.error(f"❌ Error validating history response: {str(e)}")
+                _error("❌ Error validating history response: %s", e)
                 success = False
         
-        return success, response
+        return success, history_items
         
+    def _send_cached_request(self, video_url):
+        """Send the caching test's second summarize request alongside a history lookup.
+
+        Returns (success, response, elapsed_ns, history_success, history_response).
+        """
+        # Second request - should be cached. It goes out back-to-back on the
+        # kept-alive pooled connection, and the history lookup doesn't depend
+        # on it, so both go out together
+        _info("Making second request to the same video (should be cached)...")
+        second_start = time.perf_counter_ns()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            second_future = executor.submit(
+                _carry_batch(self.run_test),
+                "Second Summarization Request (Cached)",
+                "POST",
+                "summarize",
+                200,
+                data={"youtube_url": video_url}
+            )
+            history_future = executor.submit(
+                _carry_batch(self.run_test),
+                "History After Summarization",
+                "GET",
+                "history",
+                200
+            )
+            second_success, second_response = second_future.result()
+            second_request_ns = time.perf_counter_ns() - second_start
+            history_success, history_response = history_future.result()
+        return second_success, second_response, second_request_ns, history_success, history_response
+
+    @batched_log()
     def test_caching_functionality(self, video_url):
         """Test that caching works correctly for previously summarized videos"""
-        logger.info("\n🔍 Testing caching functionality...")
-        
-        # First request - should not be cached
-        logger.info("Making first request to summarize video (should not be cached)...")
-        first_success, first_response = self.run_test(
-            "First Summarization Request",
-            "POST",
-            "summarize",
-            200,
-            data={"youtube_url": video_url}
-        )
-        
-        if not first_success:
-            logger.error("❌ First summarization request failed, cannot test caching")
-            return False, None
+        _info("\n🔍 Testing caching functionality...")
         
-        first_data = first_response.json()
-        first_is_cached = first_data.get('is_cached', False)
-        
-        if first_is_cached:
-            logger.warning("⚠️ First request was already cached (video was previously summarized)")
+        # First request - should not be cached. A recent response saved by an
+        # earlier run stands in for it, since the backend has cached the video
+        # by then anyway and the second request is the one under test
+        video_id = self._video_ids.get(video_url) or _extract_video_id(video_url)
+        fixture = self._load_fixture(video_id) if self.reuse_first_summary else None
+        if fixture:
+            _info("⏭️ First request skipped - reusing the saved summarization of %s", video_id)
+            first_data, first_request_ns = fixture['data'], fixture['elapsed_ns']
         else:
-            logger.info("✅ First request was not cached (as expected)")
+            _info("Making first request to summarize video (should not be cached)...")
+            first_start = time.perf_counter_ns()
+            first_success, first_response = self.run_test(
+                "First Summarization Request",
+                "POST",
+                "summarize",
+                200,
+                data={"youtube_url": video_url}
+            )
+            first_request_ns = time.perf_counter_ns() - first_start
+            
+            if not first_success:
+                _error("❌ First summarization request failed, cannot test caching")
+                return False, None
+            
+            first_data = self._json(first_response)
+            
+            if first_data.get('is_cached', False):
+                _warning("⚠️ First request was already cached (video was previously summarized)")
+            else:
+                _info("✅ First request was not cached (as expected)")
+                # Only an uncached timing is a fair baseline for later runs
+                if self.reuse_first_summary:
+                    self._save_fixture(video_id, first_data, first_request_ns)
         
         # Record the time for the first request
-        first_request_time = first_response.elapsed.total_seconds()
-        logger.info(f"⏱️ First request time: {first_request_time:.2f} seconds")
-        
-        # Wait a moment before making the second request
-        time.sleep(1)
+        _info("⏱️ First request time: %.2f seconds%s", first_request_ns / 1e9, " (saved)" if fixture else "")
         
-        # Second request - should be cached
-        logger.info("Making second request to the same video (should be cached)...")
-        second_success, second_response = self.run_test(
-            "Second Summarization Request (Cached)",
-            "POST",
-            "summarize",
-            200,
-            data={"youtube_url": video_url}
-        )
+        second_success, second_response, second_request_ns, history_success, history_response = \
+            self._send_cached_request(video_url)
         
         if not second_success:
-            logger.error("❌ Second summarization request failed")
+            _error("❌ Second summarization request failed")
             return False, None
         
-        second_data = second_response.json()
+        second_data = self._json(second_response)
+        
+        # A saved first summarization goes stale if the backend loses its copy
+        # (e.g. a reset database). The request just sent was then really the
+        # first one, so it replaces the saved file and the check runs again
+        if fixture and not second_data.get('is_cached', False):
+            _warning("⚠️ Saved summarization of %s is stale - the backend had no cached copy", video_id)
+            first_data, first_request_ns = second_data, second_request_ns
+            self._save_fixture(video_id, first_data, first_request_ns)
+            _info("⏱️ First request time: %.2f seconds", first_request_ns / 1e9)
+            second_success, second_response, second_request_ns, history_success, history_response = \
+                self._send_cached_request(video_url)
+            if not second_success:
+                _error("❌ Second summarization request failed")
+                return False, None
+            second_data = self._json(second_response)
+        
         second_is_cached = second_data.get('is_cached', False)
         
         # Record the time for the second request
-        second_request_time = second_response.elapsed.total_seconds()
-        logger.info(f"⏱️ Second request time: {second_request_time:.2f} seconds")
+        _info("⏱️ Second request time: %.2f seconds", second_request_ns / 1e9)
         
         # Verify caching status
         if second_is_cached:
-            logger.info("✅ Second request was cached (as expected)")
+            _info("✅ Second request was cached (as expected)")
         else:
-            logger.error("❌ Second request was not cached")
+            _error("❌ Second request was not cached")
             return False, second_response
         
-        # Verify response time improvement
-        if second_request_time < first_request_time:
-            logger.info(f"✅ Cached response was faster: {first_request_time:.2f}s vs {second_request_time:.2f}s")
+        # Verify response time improvement - a cache hit should be at least
+        # twice as fast. Compared in integer nanoseconds to avoid float noise
+        if second_request_ns * 2 <= first_request_ns:
+            _info("✅ Cached response was at least 2x faster: %.3fs vs %.3fs", first_request_ns / 1e9, second_request_ns / 1e9)
         else:
-            logger.warning(f"⚠️ Cached response was not faster: {first_request_time:.2f}s vs {second_request_time:.2f}s")
+            _warning("⚠️ Cached response was not 2x faster: %.3fs vs %.3fs", first_request_ns / 1e9, second_request_ns / 1e9)
         
         # Verify that the content is the same in both responses
         if first_data.get('transcript') == second_data.get('transcript') and \
            first_data.get('summary') == second_data.get('summary'):
-            logger.info("✅ Cached response content matches original response")
+            _info("✅ Cached response content matches original response")
         else:
-            logger.error("❌ Cached response content differs from original response")
+            _error("❌ Cached response content differs from original response")
             return False, second_response
         
+        # Look for the video in history. Only the newest entries come back and
+        # a cache hit doesn't refresh its timestamp, so an older video can be
+        # missing on a busy backend - that alone isn't a failure
+        video_id = first_data.get('video_id')
+        history_items = self._json(history_response) if history_success else []
+        history_ids = {item.get('video_id') for item in history_items}
+        if video_id in history_ids:
+            _info("✅ Cached video is present in history")
+        else:
+            _warning("⚠️ Cached video is not among the newest history entries")
+        
         return True, second_response
         
+    @batched_log()
     def test_recent_videos_api(self):
         """Test that the history API returns recent videos (up to 6)"""
-        logger.info("\n🔍 Testing recent videos API...")
+        _info("\n🔍 Testing recent videos API...")
         
-        success, response = self.run_test(
-            "Get Recent Videos",
-            "GET",
-            "history",
-            200
-        )
+        success, history_items = self._fetch_history("Get Recent Videos")
         
         if not success:
-            logger.error("❌ Recent videos API request failed")
+            _error("❌ Recent videos API request failed")
             return False, None
             
         try:
-            history_items = response.json()
-            
             # Check if we have history items
             if not history_items:
-                logger.warning("⚠️ No history items found, cannot test recent videos feature")
-                return False, response
+                _warning("⚠️ No history items found, cannot test recent videos feature")
+                return False, history_items
                 
             # Check if we have up to 6 recent videos
-            recent_videos = history_items[:6]
-            logger.info(f"📚 Found {len(recent_videos)} recent videos")
+            recent_videos = history_items[:self.recent_videos_limit]
+            _info("📚 Found %d recent videos", len(recent_videos))
             
-            # Verify each recent video has required metadata
-            for i, video in enumerate(recent_videos):
-                logger.info(f"Checking video {i+1}:")
-                
-                # Check for video ID
-                if 'video_id' in video and video['video_id']:
-                    logger.info(f"✅ Video {i+1} has video_id: {video['video_id']}")
-                else:
-                    logger.error(f"❌ Video {i+1} missing video_id")
-                    success = False
-                
-                # Check for title
-                if 'title' in video and video['title']:
-                    logger.info(f"✅ Video {i+1} has title: {video['title'][:30]}...")
-                else:
-                    logger.warning(f"⚠️ Video {i+1} missing title")
-                
-                # Check for channel
-                if 'channel' in video and video['channel']:
-                    logger.info(f"✅ Video {i+1} has channel: {video['channel']}")
-                else:
-                    logger.warning(f"⚠️ Video {i+1} missing channel")
-                
-                # Check for thumbnail
-                if 'thumbnail_url' in video and video['thumbnail_url']:
-                    logger.info(f"✅ Video {i+1} has thumbnail")
-                else:
-                    logger.warning(f"⚠️ Video {i+1} missing thumbnail")
+            # Verify each recent video has required metadata, logging only gaps
+            missing = [(i + 1, field) for i, video in enumerate(recent_videos) for field in _RECENT_REQUIRED if not video.get(field)]
+            missing_optional = [(i + 1, field) for i, video in enumerate(recent_videos) for field in _RECENT_OPTIONAL if not video.get(field)]
+            if missing:
+                _error("❌ Recent videos missing required fields (video, field): %s", missing)
+                success = False
+            if missing_optional:
+                _warning("⚠️ Recent videos missing optional fields (video, field): %s", missing_optional)
+            _info("✅ Validated %d/%d recent videos", len(recent_videos) - len({i for i, _ in missing}), len(recent_videos))
                     
-            return success, response
+            return success, recent_videos
             
         except Exception as e:
-            logger.error(f"❌ Error validating recent videos: {str(e)}")
-            return False, response
+            _error("❌ Error validating recent videos: %s", e)
+            return False, history_items
 
-def main():
+def main(argv=None):
+    args = parse_args("YouTube summarizer API tests", argv)
     print("=" * 80)
     print("🧪 YOUTUBE VIDEO SUMMARIZER API TEST SUITE 🧪")
     print("=" * 80)
     
-    tester = YouTubeSummarizerTester()
-    
-    # Run basic API tests
-    api_status_success, _ = tester.test_api_status()
-    invalid_url_success, _ = tester.test_invalid_youtube_url()
+    with cassette("backend_test_new.yaml", record=args.record) as recording, \
+         YouTubeSummarizerTester(reuse_first_summary=recording is None) as tester:
+        # Run basic API tests - they don't depend on each other, so overlap them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            status_future = executor.submit(tester.test_api_status)
+            invalid_url_future = executor.submit(tester.test_invalid_youtube_url)
+            api_status_success, _ = status_future.result()
+            invalid_url_success, _ = invalid_url_future.result()
     
-    # Test each video type
-    music_video_success, _ = tester.test_valid_youtube_url(tester.music_video_url, "Music")
-    comedy_sketch_success, _ = tester.test_valid_youtube_url(tester.comedy_sketch_url, "Comedy Sketch")
+        # Test each video type and the caching flow (on its own video)
+        # concurrently - every summarization is a long blocking POST, so the
+        # phase takes as long as the slowest one
+        with ThreadPoolExecutor(max_workers=len(tester.video_cases) + 1) as executor:
+            futures = {
+                executor.submit(tester.test_valid_youtube_url, url, kind): kind
+                for url, kind in tester.video_cases
+            }
+            futures[executor.submit(tester.test_caching_functionality, tester.educational_video_url)] = "Caching"
+            results = {futures[future]: future.result()[0] for future in as_completed(futures)}
     
-    # Test caching functionality with the educational video
-    caching_success, _ = tester.test_caching_functionality(tester.educational_video_url)
+        # History checks run once the pool has joined so they see every new summary
+        history_success, _ = tester.test_get_history()
+        recent_videos_success, _ = tester.test_recent_videos_api()
     
-    # Test recent videos API
-    recent_videos_success, _ = tester.test_recent_videos_api()
-    
-    # Print results
-    print("\n" + "=" * 80)
-    print(f"📊 SUMMARY: Tests passed: {tester.tests_passed}/{tester.tests_run}")
-    print("=" * 80)
+        # Print results
+        print("\n" + "=" * 80)
+        print(f"📊 SUMMARY: Tests passed: {tester.tests_passed}/{tester.tests_run}")
+        failed_cases = sorted(kind for kind, ok in results.items() if not ok)
+        if failed_cases:
+            print(f"❌ Failed: {', '.join(failed_cases)}")
+        for line in tester.latency_report():
+            print(f"⏱️ {line}")
+        print("=" * 80)
     
-    return 0 if tester.tests_passed == tester.tests_run else 1
+        # A test can fail its own checks after its request already counted as
+        # passed, so the per-test results decide the exit status as well
+        all_succeeded = all((
+            api_status_success,
+            invalid_url_success,
+            *results.values(),
+            history_success,
+            recent_videos_success
+        ))
+        return 0 if all_succeeded and tester.tests_passed == tester.tests_run else 1
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,270 @@
+"""Shared plumbing for the backend API test suites"""
+import argparse
+import logging
+import re
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry
+try:
+    import vcr
+except ImportError:
+    vcr = None
+
+logger = logging.getLogger(__name__)
+# urllib3 logs each retry it makes here, at DEBUG
+_retry_logger = logging.getLogger('urllib3.util.retry')
+
+DEFAULT_BASE_URL = "https://2741a2ce-05d6-4231-a8fb-a5540c0f1367.preview.emergentagent.com"
+
+JSON_HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+
+# Compiled once at import and shared by every summary check
+EMOJI_RE = re.compile(
+    '['
+    '\U0001F300-\U0001F6FF'  # pictographs, emoticons, transport and map symbols
+    '\U0001F700-\U0001F77F'  # alchemical symbols
+    '\U0001F780-\U0001F7FF'  # geometric shapes extended
+    '\U0001F800-\U0001F8FF'  # supplemental arrows-C
+    '\U0001F900-\U0001F9FF'  # supplemental symbols and pictographs
+    '\U0001FA00-\U0001FA6F'  # chess symbols
+    '\U0001FA70-\U0001FAFF'  # symbols and pictographs extended-A
+    '\u2600-\u26FF'          # miscellaneous symbols (sun, coffee, lightning)
+    '\u2702-\u27B0'          # dingbats
+    '\u2B00-\u2BFF'          # miscellaneous symbols and arrows (star)
+    '\u24C2'                 # circled M
+    '\U0001F170-\U0001F251'  # enclosed alphanumeric and ideographic supplements
+    ']'
+)
+MUSIC_EMOJIS = frozenset(("🎵", "🎶", "🎤"))
+# One pass over a summary classifies every emoji; the music ones sit inside
+# EMOJI_RE's ranges, so their alternative has to come first
+SUMMARY_RE = re.compile(f"(?P<music>[{''.join(sorted(MUSIC_EMOJIS))}])|(?P<emoji>{EMOJI_RE.pattern})")
+
+_getaddrinfo = socket.getaddrinfo
+
+@lru_cache(maxsize=32)
+def _cached_getaddrinfo(*args, **kwargs):
+    # Failed lookups raise and so are never cached
+    return tuple(_getaddrinfo(*args, **kwargs))
+
+# Open testers sharing the process-wide hooks below; they are only
+# installed while one is
+_hooks_lock = threading.Lock()
+_hooks_users = 0
+_retry_level = logging.NOTSET
+
+def _install_hooks():
+    """Install the process-wide hooks the testers rely on while any tester is open.
+
+    Each host is resolved once instead of on every pool miss, and urllib3's
+    retry records are surfaced so a test that only passed on a later attempt
+    shows in the run's output.
+    """
+    global _hooks_users, _retry_level
+    with _hooks_lock:
+        if _hooks_users == 0:
+            socket.getaddrinfo = _cached_getaddrinfo
+            _retry_level = _retry_logger.level
+            _retry_logger.setLevel(logging.DEBUG)
+        _hooks_users += 1
+
+def _remove_hooks():
+    """Undo _install_hooks and drop the cached answers once the last tester closes"""
+    global _hooks_users
+    with _hooks_lock:
+        _hooks_users -= 1
+        if _hooks_users == 0:
+            socket.getaddrinfo = _getaddrinfo
+            _cached_getaddrinfo.cache_clear()
+            _retry_logger.setLevel(_retry_level)
+
+def cassette(name, record=False):
+    """Replay recorded API responses from fixtures/, recording any that are missing"""
+    if vcr is None:
+        logger.warning("⚠️ vcrpy not installed, calling the live API")
+        return nullcontext()
+    return vcr.VCR(
+        cassette_library_dir=str(FIXTURES_DIR),
+        match_on=['method', 'uri', 'body'],
+        record_mode='all' if record else 'new_episodes'
+    ).use_cassette(name)
+
+def peek(response, n=512):
+    """Decode at most the first n bytes of a response body for logging"""
+    try:
+        chunk = next(response.iter_content(n), b'')
+    finally:
+        response.close()
+    return chunk.decode('utf-8', 'replace')
+
+def parse_args(description, argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="re-record every response instead of replaying the fixtures"
+    )
+    return parser.parse_args(argv)
+
+class TunedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets skip Nagle's delay and stay alive between tests"""
+
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault('socket_options', self.socket_options)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+class BaseAPITester:
+    """Session, counters and response decoding shared by the API testers"""
+
+    # (connect, read) seconds; summarization can take minutes server-side
+    timeout = (5, 300)
+
+    def __init__(self, base_url=DEFAULT_BASE_URL):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.tests_run = 0
+        self.tests_passed = 0
+        # Tests may run concurrently, so counter updates go through this lock
+        self._lock = threading.Lock()
+        # Results later tests build on, under explicit keys
+        self.state = {}
+        # "METHOD /path" -> wall-clock seconds of each request sent
+        self._latencies = {}
+        # One keep-alive session for the whole run so every test reuses the
+        # same pooled connection instead of handshaking per request
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        # One host, but enough pooled connections that the concurrent test
+        # phases never open throwaway connections beyond the pool
+        adapter = TunedAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # Never make a worker wait for a free connection; a burst past
+            # the pool opens an extra one that is discarded afterwards
+            pool_block=False,
+            # Retry gateway errors from the preview proxy with exponential backoff.
+            # Read timeouts are not retried: a hung summarize would otherwise be
+            # re-submitted, and the caller would never see a Timeout
+            max_retries=Retry(
+                total=3,
+                read=False,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                # Hand back the last gateway error instead of raising, so the
+                # test still logs its status and body
+                raise_on_status=False,
+                allowed_methods=frozenset(['GET', 'POST', 'DELETE'])
+            )
+        )
+        # Plain http too, for testers pointed at a local backend
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        _install_hooks()
+        self._hooked = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release pooled connections and, with the last tester, the process-wide hooks"""
+        self.session.close()
+        if self._hooked:
+            self._hooked = False
+            _remove_hooks()
+
+    def _record_run(self):
+        with self._lock:
+            self.tests_run += 1
+
+    def _record_pass(self):
+        with self._lock:
+            self.tests_passed += 1
+
+    def _request(self, method, endpoint, **kwargs):
+        """Send a request to an API endpoint over the pooled session"""
+        url = f"{self.api_url}/{endpoint}"
+        kwargs.setdefault('timeout', self.timeout)
+        # Encode bodies with orjson; the session already sends the JSON Content-Type
+        payload = kwargs.pop('json', None)
+        if payload is not None:
+            kwargs['data'] = orjson.dumps(payload)
+        return self._send(method, endpoint, url, **kwargs)
+
+    def _send(self, method, endpoint, url, **kwargs):
+        # Timed around the full request/response cycle, failures included
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+            if not kwargs.get('stream') and logger.isEnabledFor(logging.DEBUG):
+                # raw.tell() counts the bytes read off the wire, before decoding
+                logger.debug(
+                    "%s /%s: %d bytes on the wire, %d decoded (%s)",
+                    method, endpoint, response.raw.tell(), len(response.content),
+                    response.headers.get('Content-Encoding', 'identity')
+                )
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                # Keyed on the path alone so query variants share one endpoint
+                self._latencies.setdefault(f"{method} /{endpoint.partition('?')[0]}", []).append(elapsed)
+
+    def latency_report(self):
+        """Return one p50/p95/p99 line per endpoint requested during the run"""
+        lines = []
+        for name, samples in sorted(self._latencies.items()):
+            if len(samples) > 1:
+                cuts = statistics.quantiles(samples, n=100, method='inclusive')
+                p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+            else:
+                p50 = p95 = p99 = samples[0]
+            lines.append(
+                f"{name} p50={p50 * 1e3:.1f}ms p95={p95 * 1e3:.1f}ms "
+                f"p99={p99 * 1e3:.1f}ms n={len(samples)}"
+            )
+        return lines
+
+    def warmup(self, connections):
+        """Open pooled connections ahead of a concurrent batch; not counted as a test"""
+        def ping(_):
+            try:
+                # Straight to the session so the pings stay out of the latency samples
+                self.session.get(f"{self.api_url}/", timeout=self.timeout).close()
+            except requests.RequestException as e:
+                logger.debug("Warmup request failed: %s", e)
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(ping, range(connections)))
+
+    def _json(self, response):
+        """Decode a response body once and reuse it for later checks.
+
+        The raw bytes go straight to orjson in a single pass, with no str
+        decode first. An empty body decodes to {}.
+        """
+        if not hasattr(response, '_cached_json'):
+            body = response.content
+            response._cached_json = orjson.loads(body) if body else {}
+        return response._cached_json
@@ -0,0 +1,239 @@
+"""Checks against the summarizer API.
+
+The live checks are opt-in: set BACKEND_URLS to a comma-separated list of
+deployments to run every check against each of them, otherwise they are
+skipped. Run with ``pytest -n auto`` to spread the parametrized cases
+across workers.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend_test import PodBriefAPITester
+from backend_test_new import YouTubeSummarizerTester
+from tests.api_tester import EMOJI_RE, SUMMARY_RE
+
+BASE_URLS = [url for url in os.environ.get("BACKEND_URLS", "").split(",") if url]
+
+
+@pytest.fixture(scope="session", params=BASE_URLS or [None])
+def base_url(request):
+    if request.param is None:
+        pytest.skip("set BACKEND_URLS to run the live API checks")
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def api(base_url):
+    with YouTubeSummarizerTester(base_url) as tester:
+        yield tester
+
+
+@pytest.fixture(scope="session")
+def podbrief(base_url):
+    with PodBriefAPITester(base_url) as tester:
+        yield tester
+
+
+def test_api_status(api):
+    success, _ = api.test_api_status()
+    assert success
+
+
+def test_invalid_youtube_url(api):
+    success, _ = api.test_invalid_youtube_url()
+    assert success
+
+
+@pytest.mark.parametrize("url,kind", YouTubeSummarizerTester.video_cases)
+def test_summarize(api, url, kind):
+    success, _ = api.test_valid_youtube_url(url, kind)
+    assert success
+
+
+def test_caching(api):
+    success, _ = api.test_caching_functionality(api.educational_video_url)
+    assert success
+
+
+def test_recent_videos(api):
+    success, _ = api.test_recent_videos_api()
+    assert success
+
+
+def test_get_history(api):
+    success, _ = api.test_get_history()
+    assert success
+
+
+@pytest.mark.parametrize("channel_url", PodBriefAPITester.channel_urls)
+def test_channel_videos(podbrief, channel_url):
+    assert podbrief.test_channel_videos(channel_url)
+
+
+def test_invalid_channel_url(podbrief):
+    assert podbrief.test_invalid_channel_url()
+
+
+def test_invalid_video_url(podbrief):
+    assert podbrief.test_invalid_video_url()
+
+
+def test_summarize_channel_video(podbrief):
+    videos = podbrief.state.get('channel_videos', {}).get(PodBriefAPITester.channel_urls[0])
+    if not videos:
+        pytest.skip("no videos from the first channel in this worker")
+    video_url = videos[0].get("link") or videos[0].get("url")
+    assert podbrief.test_summarize_video(video_url)
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Answers every request only after the client's read timeout has passed"""
+
+    def _reply_late(self):
+        time.sleep(1)
+        self.send_response(200)
+        self.end_headers()
+
+    do_GET = do_POST = _reply_late
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def _serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def slow_url():
+    with _serve(_SlowHandler) as server:
+        yield server.url
+
+
+@pytest.mark.parametrize("tester_cls", [YouTubeSummarizerTester, PodBriefAPITester])
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_read_timeout_is_reported(slow_url, tester_cls, method, caplog):
+    with tester_cls(slow_url) as tester:
+        tester.timeout = (1, 0.2)
+        success, _ = tester.run_test("Slow endpoint", method, "slow", 200, data={} if method == "POST" else None)
+    assert not success
+    assert "Timeout after 0.2s" in caplog.text
+
+
+class _SummarizerHandler(BaseHTTPRequestHandler):
+    """A backend that summarizes at once and reports every video it has seen as cached"""
+
+    def _reply(self, body):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._reply([{"video_id": video_id} for video_id in self.server.seen])
+
+    def do_POST(self):
+        url = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["youtube_url"]
+        video_id = url.rpartition("v=")[2]
+        is_cached = video_id in self.server.seen
+        self.server.seen.add(video_id)
+        self.server.posts += 1
+        self._reply({
+            "video_id": video_id,
+            "url": url,
+            "transcript": "transcript",
+            "summary": "summary",
+            "is_cached": is_cached
+        })
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def summarizer(tmp_path, monkeypatch, caplog):
+    # Saved first summarizations land in a per-test directory
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: str(tmp_path))
+    caplog.set_level(logging.INFO)
+    with _serve(_SummarizerHandler) as server:
+        server.seen = set()
+        server.posts = 0
+        yield server
+
+
+def _run_caching_test(server, **kwargs):
+    with YouTubeSummarizerTester(server.url, **kwargs) as tester:
+        success, _ = tester.test_caching_functionality(tester.educational_video_url)
+        return success, tester._fixture_path("8S0FDjFBj8o")
+
+
+def test_caching_saves_then_reuses_first_summary(summarizer, caplog):
+    success, saved = _run_caching_test(summarizer)
+    assert success and summarizer.posts == 2
+    assert saved.exists()
+
+    caplog.clear()
+    success, _ = _run_caching_test(summarizer)
+    assert success and summarizer.posts == 3
+    assert "First request skipped" in caplog.text
+
+
+def test_caching_replaces_stale_first_summary(summarizer, caplog):
+    _run_caching_test(summarizer)
+    # The backend loses its copy, as after a database reset
+    summarizer.seen.clear()
+
+    caplog.clear()
+    success, saved = _run_caching_test(summarizer)
+    assert success and summarizer.posts == 4
+    assert "is stale" in caplog.text
+    assert saved.exists()
+
+
+def test_caching_ignores_expired_first_summary(summarizer, caplog):
+    _, saved = _run_caching_test(summarizer)
+    expired = time.time() - YouTubeSummarizerTester.fixture_max_age - 60
+    os.utime(saved, (expired, expired))
+
+    caplog.clear()
+    success, _ = _run_caching_test(summarizer)
+    assert success and summarizer.posts == 4
+    assert "First request skipped" not in caplog.text
+
+
+def test_caching_without_reuse_saves_nothing(summarizer):
+    success, saved = _run_caching_test(summarizer, reuse_first_summary=False)
+    assert success and summarizer.posts == 2
+    assert not saved.exists()
+
+
+def test_emoji_pattern_ignores_plain_text():
+    assert EMOJI_RE.search("plain text 2024, with punctuation: a-z & A-Z!") is None
+
+
+@pytest.mark.parametrize("emoji", ["⭐", "☕", "✅", "🆗"])
+def test_emoji_pattern_matches_emoji(emoji):
+    assert EMOJI_RE.fullmatch(emoji)
+
+
+def test_summary_pattern_groups_music_emoji():
+    groups = [match.lastgroup for match in SUMMARY_RE.finditer("🎵 plain 🎶 text 🎤 ⭐")]
+    assert groups == ["music", "music", "music", "emoji"]